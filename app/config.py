@@ -10,6 +10,7 @@ class Settings(BaseSettings):
     ollama_model: str = "gemma3:4b"
     whisper_model: str = "base"
     whisper_compute_type: str = "int8"
+    whisper_concurrency: int = 1  # transcriptions allowed to run at once
     summarizer: str = "openrouter"  # "openrouter", "ollama", "claude", or "gemini"
     fallback_summarizer: str = "ollama"  # fallback if primary fails ("" to disable)
     auth_password: str = ""  # set to enable password gate (leave empty to disable)
@@ -1,20 +1,24 @@
 import asyncio
 import hashlib
+import hmac
 import json
 import logging
+import sqlite3
 import time
 from collections import defaultdict
 from contextlib import asynccontextmanager
 
 import httpx
+from cachetools import TTLCache
 from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 
 from app.config import settings
 from app.models import Job, JobStatus, jobs, create_job, get_job
-from app.services import youtube
+from app.services import youtube, transcriber
 from app.pipeline import process_job
 from app import storage
 
@@ -23,6 +27,11 @@ logger = logging.getLogger(__name__)
 
 JOB_MAX_AGE = 86400
 SSE_TIMEOUT = 7200
+SSE_KEEPALIVE = 30
+_SSE_PING = b":ping\n\n"
+CLEANUP_INTERVAL = 300
+RATE_BUCKET_IDLE = 120  # a bucket idle this long is full again, safe to drop
+LOGIN_FAILURE_MAX_AGE = 3600
 
 # Auth: cookie token is sha256(password + salt)
 _AUTH_COOKIE = "vs_auth"
@@ -34,48 +43,98 @@ def _make_token(password: str) -> str:
     return hashlib.sha256(f"{password}:{_AUTH_SALT}".encode()).hexdigest()
 
 
-# Rate limiter: per-IP request counts
-_rate_buckets: dict[str, list[float]] = defaultdict(list)
+_EXPECTED_TOKEN = _make_token(settings.auth_password)
+# compare_digest rejects non-ASCII str, and cookies can carry arbitrary bytes
+_EXPECTED_TOKEN_BYTES = _EXPECTED_TOKEN.encode()
 
-# Login ban: permanent after 5 failed attempts
+
+# Rate limiter: per-IP token bucket of [tokens, last_refill]
+_rate_buckets: dict[str, list[float]] = {}
+
+# Login ban: 24h after 5 failed attempts, bounded so spoofed IPs can't grow it forever
 _MAX_LOGIN_ATTEMPTS = 5
+_BAN_DURATION = 86400
 _login_failures: dict[str, int] = defaultdict(int)
-_banned_ips: set[str] = set()
+_last_failure_at: dict[str, float] = {}
+_banned_ips: TTLCache = TTLCache(maxsize=100_000, ttl=_BAN_DURATION)
 
 
 def _is_banned(ip: str) -> bool:
     return ip in _banned_ips
 
 
-def _record_failure(ip: str):
+def _record_failure(ip: str) -> int:
+    """Count a failed login and return the attempts left before a ban."""
     _login_failures[ip] += 1
-    if _login_failures[ip] >= _MAX_LOGIN_ATTEMPTS:
-        _banned_ips.add(ip)
-        logger.warning("IP %s permanently banned after %d failed attempts", ip, _login_failures[ip])
+    _last_failure_at[ip] = time.time()
+    attempts = _login_failures[ip]
+    if attempts >= _MAX_LOGIN_ATTEMPTS:
+        _banned_ips[ip] = True
+        # Counter is no longer needed once the ban is in place
+        del _login_failures[ip]
+        _last_failure_at.pop(ip, None)
+        logger.warning("IP %s banned for %ds after %d failed attempts", ip, _BAN_DURATION, attempts)
+    return _MAX_LOGIN_ATTEMPTS - attempts
 
 
 def _check_rate_limit(ip: str) -> bool:
     now = time.time()
-    bucket = _rate_buckets[ip]
-    # Prune old entries
-    _rate_buckets[ip] = [t for t in bucket if now - t < 60]
-    if len(_rate_buckets[ip]) >= settings.rate_limit:
+    bucket = _rate_buckets.setdefault(ip, [float(settings.rate_limit), now])
+    # Refill at rate_limit tokens per minute, capped at rate_limit
+    elapsed = now - bucket[1]
+    bucket[0] = min(settings.rate_limit, bucket[0] + elapsed * settings.rate_limit / 60)
+    bucket[1] = now
+    if bucket[0] < 1:
         return False
-    _rate_buckets[ip].append(now)
+    bucket[0] -= 1
     return True
 
 
+# History list cache: the homepage is hit far more often than jobs finish
+_HISTORY_TTL = 5
+_history_cache: list[dict] = []
+_history_ts = 0.0
+
+
+async def _get_history() -> list[dict]:
+    global _history_cache, _history_ts
+    now = time.time()
+    if now - _history_ts >= _HISTORY_TTL:
+        _history_cache = await asyncio.to_thread(storage.list_jobs)
+        _history_ts = now
+    return _history_cache
+
+
+def _invalidate_history(_task: asyncio.Task | None = None):
+    global _history_ts
+    _history_ts = 0.0
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     storage.init_db()
+    try:
+        await asyncio.to_thread(transcriber.preload_model)
+    except Exception:
+        # History and past results don't need Whisper; jobs load it lazily
+        logger.exception("Failed to preload Whisper model; will retry on the first job")
+    app.state.http = httpx.AsyncClient(
+        timeout=5, limits=httpx.Limits(max_keepalive_connections=10)
+    )
     task = asyncio.create_task(_cleanup_loop())
     yield
     task.cancel()
+    await app.state.http.aclose()
+    await asyncio.to_thread(storage.flush)
 
 
 app = FastAPI(title="Video Summarize", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+# Templates don't change at runtime: skip the per-render stat() and keep
+# compiled bytecode across restarts
+templates.env.auto_reload = False
+templates.env.bytecode_cache = FileSystemBytecodeCache()
 
 
 # Auth middleware
@@ -94,16 +153,32 @@ async def auth_middleware(request: Request, call_next):
         return HTMLResponse("<h1>BANNED</h1><p>Too many failed login attempts. Try again later.</p>", status_code=403)
 
     token = request.cookies.get(_AUTH_COOKIE)
-    if token != _make_token(settings.auth_password):
+    if not hmac.compare_digest((token or "").encode(), _EXPECTED_TOKEN_BYTES):
         return RedirectResponse(url="/login", status_code=303)
 
     return await call_next(request)
 
 
+def _sweep_ip_state(now: float):
+    """Drop idle rate-limit buckets and stale login-failure counters."""
+    for ip, bucket in list(_rate_buckets.items()):
+        if now - bucket[1] > RATE_BUCKET_IDLE:
+            del _rate_buckets[ip]
+    for ip, ts in list(_last_failure_at.items()):
+        if now - ts > LOGIN_FAILURE_MAX_AGE:
+            del _last_failure_at[ip]
+            _login_failures.pop(ip, None)
+
+
 async def _cleanup_loop():
     while True:
-        await asyncio.sleep(3600)
+        await asyncio.sleep(CLEANUP_INTERVAL)
         now = time.time()
+        _sweep_ip_state(now)
+        try:
+            await asyncio.to_thread(storage.incremental_vacuum)
+        except sqlite3.Error:
+            logger.exception("Incremental vacuum failed")
         expired = [
             jid
             for jid, j in jobs.items()
@@ -128,15 +203,14 @@ async def login_submit(request: Request, username: str = Form(...), password: st
     ip = request.client.host
     if _is_banned(ip):
         return HTMLResponse("<h1>BANNED</h1><p>Too many failed login attempts. Try again later.</p>", status_code=403)
-    if password != settings.auth_password:
-        _record_failure(ip)
-        remaining = _MAX_LOGIN_ATTEMPTS - _login_failures[ip]
+    if not hmac.compare_digest(password.encode(), settings.auth_password.encode()):
+        remaining = _record_failure(ip)
         logger.warning("Failed login from %s (%d attempts left)", ip, max(remaining, 0))
         return RedirectResponse(url="/login?error=1", status_code=303)
     response = RedirectResponse(url="/", status_code=303)
     response.set_cookie(
         _AUTH_COOKIE,
-        _make_token(password),
+        _EXPECTED_TOKEN,
         httponly=True,
         samesite="strict",
         max_age=86400 * 30,
@@ -154,7 +228,7 @@ async def login_submit(request: Request, username: str = Form(...), password: st
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    history = await asyncio.to_thread(storage.list_jobs)
+    history = await _get_history()
     # Find any active (in-progress) jobs
     active = [
         j for j in jobs.values()
@@ -163,18 +237,22 @@ async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request, "history": history, "active": active})
 
 
+@app.get("/api/history")
+async def api_history(limit: int = 20):
+    # SQLite builds the JSON, so skip FastAPI's encoder entirely
+    body = await asyncio.to_thread(storage.list_jobs_json, min(max(limit, 1), 100))
+    return Response(content=body, media_type="application/json")
+
+
 @app.get("/api/status")
-async def api_status():
+async def api_status(request: Request):
     if settings.summarizer != "ollama":
         return JSONResponse({"ok": True, "summarizer": settings.summarizer})
 
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                f"{settings.ollama_base_url}/api/tags", timeout=5
-            )
-            resp.raise_for_status()
-            models = [m["name"] for m in resp.json().get("models", [])]
+        resp = await request.app.state.http.get(f"{settings.ollama_base_url}/api/tags")
+        resp.raise_for_status()
+        models = [m["name"] for m in resp.json().get("models", [])]
 
         model = settings.ollama_model
         model_ready = any(
@@ -237,17 +315,13 @@ async def api_create_job(request: Request, url: str = Form(...)):
     job = create_job(url)
     job.created_by = request.cookies.get(_USER_COOKIE, "")
 
-    try:
-        job.status = JobStatus.FETCHING_METADATA
-        metadata = await asyncio.to_thread(youtube.fetch_metadata, url)
-        job.metadata = metadata
-        job.status = JobStatus.CONFIRMED
-    except Exception as e:
-        job.status = JobStatus.FAILED
-        job.error = f"Failed to fetch metadata: {e}"
-        return RedirectResponse(url=f"/result/{job.id}", status_code=303)
+    # Usually cached by the /api/metadata preview. On a miss the pipeline fills
+    # it in from the download's own extraction rather than asking yt-dlp twice
+    job.metadata = youtube.cached_metadata(url)
+    job.status = JobStatus.CONFIRMED
 
-    asyncio.create_task(process_job(job))
+    task = asyncio.create_task(process_job(job))
+    task.add_done_callback(_invalidate_history)
 
     return RedirectResponse(url=f"/processing/{job.id}", status_code=303)
 
@@ -279,6 +353,9 @@ async def job_events(job_id: str):
         while True:
             if time.time() - started > SSE_TIMEOUT:
                 return
+            # Grab the event before reading state so an update made while we
+            # are suspended in `yield` still wakes the wait below
+            update = job.update_event
             if job.status != last_status or job.progress != last_progress:
                 last_status = job.status
                 last_progress = job.progress
@@ -290,11 +367,14 @@ async def job_events(job_id: str):
                         "error": job.error,
                     }
                 )
-                yield f"data: {data}\n\n"
+                yield f"data: {data}\n\n".encode()
 
                 if job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
                     return
-            await asyncio.sleep(0.5)
+            try:
+                await asyncio.wait_for(update.wait(), timeout=SSE_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield _SSE_PING
 
     return StreamingResponse(
         event_stream(),
@@ -310,8 +390,9 @@ async def job_events(job_id: str):
 @app.get("/result/{job_id}", response_class=HTMLResponse)
 async def result_page(request: Request, job_id: str):
     job = get_job(job_id)
-    if not job:
-        job = await asyncio.to_thread(storage.load_job, job_id)
+    if not job or job.status == JobStatus.COMPLETED:
+        # Completed transcripts are only kept in the database
+        job = await asyncio.to_thread(storage.load_job, job_id) or job
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return templates.TemplateResponse("result.html", {"request": request, "job": job})
@@ -1,5 +1,8 @@
+import asyncio
 import time
 import uuid
+from collections import OrderedDict
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -27,7 +30,9 @@ class Job:
     stage_detail: str = ""
     metadata: VideoMetadata | None = None
     transcript_text: str = ""
-    transcript_segments: list[TranscriptSegment] = field(default_factory=list)
+    _transcript_segments: list[TranscriptSegment] = field(default_factory=list, repr=False)
+    # Set by storage so segments are only decoded when a page actually shows them
+    _segments_loader: Callable[[], list[TranscriptSegment]] | None = field(default=None, repr=False)
     transcript_language: str = ""
     summary: str = ""
     error: str = ""
@@ -40,6 +45,26 @@ class Job:
     # Model info
     whisper_model: str = ""
     summarizer_model: str = ""
+    _word_count: int = field(default=0, repr=False)
+    # Set (and replaced) whenever status/progress changes, to wake SSE streams
+    update_event: asyncio.Event = field(default_factory=asyncio.Event, repr=False, compare=False)
+
+    def notify_update(self) -> None:
+        """Wake everyone waiting on the current update event."""
+        event, self.update_event = self.update_event, asyncio.Event()
+        event.set()
+
+    @property
+    def transcript_segments(self) -> list[TranscriptSegment]:
+        if self._segments_loader is not None:
+            self._transcript_segments = self._segments_loader()
+            self._segments_loader = None
+        return self._transcript_segments
+
+    @transcript_segments.setter
+    def transcript_segments(self, segments: list[TranscriptSegment]) -> None:
+        self._transcript_segments = segments
+        self._segments_loader = None
 
     @property
     def total_time(self) -> float:
@@ -47,16 +72,32 @@ class Job:
 
     @property
     def word_count(self) -> int:
-        return len(self.transcript_text.split()) if self.transcript_text else 0
+        # Splitting a long transcript is costly and templates read this twice
+        if not self._word_count and self.transcript_text:
+            self._word_count = len(self.transcript_text.split())
+        return self._word_count
+
+
+# In-memory job store, oldest first. Finished jobs beyond MAX_JOBS are evicted
+# on insert so a burst of submissions can't grow it until the hourly sweep.
+MAX_JOBS = 512
+jobs: OrderedDict[str, Job] = OrderedDict()
 
 
-# In-memory job store
-jobs: dict[str, Job] = {}
+def _evict_finished() -> None:
+    if len(jobs) <= MAX_JOBS:
+        return
+    for jid, job in list(jobs.items()):
+        if job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            del jobs[jid]
+            if len(jobs) <= MAX_JOBS:
+                return
 
 
 def create_job(url: str) -> Job:
     job = Job(url=url)
     jobs[job.id] = job
+    _evict_finished()
     return job
 
 
@@ -12,52 +12,62 @@ from app import storage
 logger = logging.getLogger(__name__)
 
 
+def _remove_audio(audio_path: str | None, job_dir: str) -> None:
+    """Delete the downloaded audio and the job directory if it is now empty."""
+    if audio_path:
+        os.remove(audio_path)
+    if os.path.isdir(job_dir) and not os.listdir(job_dir):
+        os.rmdir(job_dir)
+
+
 async def process_job(job: Job) -> None:
     """Run the full pipeline: download → transcribe → summarize."""
     audio_path = None
+    output_dir = os.path.join(settings.data_dir, job.id)
     try:
         # Stage 1: Download audio
         job.status = JobStatus.DOWNLOADING
         job.progress = 0
         job.stage_detail = "Downloading audio..."
+        job.notify_update()
 
         t0 = time.monotonic()
-        output_dir = os.path.join(settings.data_dir, job.id)
-        audio_path = await asyncio.to_thread(
-            youtube.download_audio, job.url, output_dir
+        metadata, audio_path = await asyncio.to_thread(
+            youtube.fetch_and_download, job.url, output_dir
         )
+        if job.metadata is None:
+            job.metadata = metadata
         job.download_time = time.monotonic() - t0
         job.progress = 100
         job.stage_detail = "Download complete"
+        job.notify_update()
 
         # Stage 2: Transcribe
         job.status = JobStatus.TRANSCRIBING
         job.progress = 0
         job.whisper_model = settings.whisper_model
         job.stage_detail = "Loading transcription model..."
+        job.notify_update()
 
         def on_progress(done: int, total: int) -> None:
             job.progress = min(int(done / total * 100), 99)
             job.stage_detail = f"Transcribing... ({done} segments)"
+            job.notify_update()
 
         t0 = time.monotonic()
-        result = await asyncio.to_thread(
-            transcriber.transcribe, audio_path, on_progress
-        )
+        result = await transcriber.transcribe(audio_path, on_progress)
         job.transcribe_time = time.monotonic() - t0
         job.transcript_text = result.text
         job.transcript_segments = result.segments
         job.transcript_language = result.language
         job.progress = 100
         job.stage_detail = "Transcription complete"
+        job.notify_update()
 
         # Clean up audio file
         try:
-            os.remove(audio_path)
+            await asyncio.to_thread(_remove_audio, audio_path, output_dir)
             audio_path = None
-            job_dir = os.path.join(settings.data_dir, job.id)
-            if os.path.isdir(job_dir) and not os.listdir(job_dir):
-                os.rmdir(job_dir)
         except OSError:
             pass
 
@@ -65,6 +75,7 @@ async def process_job(job: Job) -> None:
         job.status = JobStatus.SUMMARIZING
         job.progress = 50
         job.stage_detail = "Generating summary..."
+        job.notify_update()
 
         summarizer = get_summarizer()
         # Record which model actually ran
@@ -76,24 +87,27 @@ async def process_job(job: Job) -> None:
 
         title = job.metadata.title if job.metadata else "Unknown"
         t0 = time.monotonic()
-        job.summary = await asyncio.to_thread(
-            summarizer.summarize, job.transcript_text, title
-        )
+        job.summary = await summarizer.summarize(job.transcript_text, title)
         job.summarize_time = time.monotonic() - t0
         job.progress = 100
         job.stage_detail = "Summary complete"
 
-        # Done — persist to database
-        job.status = JobStatus.COMPLETED
+        # Done — persist to database, then keep only the status entry in
+        # memory; the result page reads the transcript back from SQLite
         await asyncio.to_thread(storage.save_job, job)
+        job.transcript_text = ""
+        job.transcript_segments = []
+        job.status = JobStatus.COMPLETED
+        job.notify_update()
 
     except Exception as e:
         logger.exception("Job %s failed", job.id)
         job.status = JobStatus.FAILED
         job.error = str(e)
-        # Clean up on failure
-        if audio_path and os.path.exists(audio_path):
-            try:
-                os.remove(audio_path)
-            except OSError:
-                pass
+        job.notify_update()
+        # Clean up on failure; a failed download has already removed its own
+        # partial file, leaving just the job directory
+        try:
+            await asyncio.to_thread(_remove_audio, audio_path, output_dir)
+        except OSError:
+            pass
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 from abc import ABC, abstractmethod
+from functools import cached_property
 
 import anthropic
 import google.generativeai as genai
@@ -24,30 +26,104 @@ _USER_PROMPT_TEMPLATE = """Video Title: {title}
 Transcript:
 {transcript}"""
 
+# Long transcripts are summarized map-reduce style: each window on its own,
+# then the partial summaries are combined into the final one.
+_CHUNK_CHARS = 60_000
+_CHUNK_OVERLAP = 1_000
+
+_CHUNK_SYSTEM_PROMPT = """You are an expert at summarizing video content. You will be given one part of a longer video transcript.
+
+List the main points, arguments, notable details, examples, and quotes from this part as concise markdown bullet points. Do not include preamble — just output the bullet points."""
+
+_CHUNK_PROMPT_TEMPLATE = """Video Title: {title}
+
+Transcript (part {part} of {total}):
+{transcript}"""
+
+_REDUCE_PROMPT_TEMPLATE = """Video Title: {title}
+
+The transcript was too long to read at once, so it was summarized in {total} consecutive parts. Write the summary of the whole video from these partial summaries.
+
+{summaries}"""
+
+
+def _chunk(transcript: str, max_chars: int = _CHUNK_CHARS, overlap: int = _CHUNK_OVERLAP) -> list[str]:
+    """Split a transcript into overlapping windows of at most max_chars, breaking on spaces."""
+    if len(transcript) <= max_chars:
+        return [transcript]
+    chunks = []
+    start = 0
+    while True:
+        end = start + max_chars
+        if end >= len(transcript):
+            chunks.append(transcript[start:])
+            return chunks
+        cut = transcript.rfind(" ", start + max_chars // 2, end)
+        if cut != -1:
+            end = cut
+        chunks.append(transcript[start:end])
+        start = end - overlap
+        space = transcript.find(" ", start, end)
+        if space != -1:
+            start = space + 1
+
 
 class Summarizer(ABC):
+    # How many requests summarize() keeps in flight at once (across all jobs)
+    max_parallel = 4
+
     @abstractmethod
-    def summarize(self, transcript: str, video_title: str) -> str:
+    async def complete(self, system: str, prompt: str) -> str:
+        """Run a single system + user prompt through the model."""
         ...
 
+    @cached_property
+    def _slots(self) -> asyncio.Semaphore:
+        return asyncio.Semaphore(self.max_parallel)
+
+    async def _complete_limited(self, system: str, prompt: str) -> str:
+        async with self._slots:
+            return await self.complete(system, prompt)
+
+    async def summarize(self, transcript: str, video_title: str) -> str:
+        chunks = _chunk(transcript)
+        if len(chunks) == 1:
+            return await self._complete_limited(
+                _SYSTEM_PROMPT,
+                _USER_PROMPT_TEMPLATE.format(title=video_title, transcript=transcript),
+            )
+
+        logger.info("Transcript is %d chars, summarizing in %d parts", len(transcript), len(chunks))
+        partials = await asyncio.gather(*(
+            self._complete_limited(
+                _CHUNK_SYSTEM_PROMPT,
+                _CHUNK_PROMPT_TEMPLATE.format(
+                    title=video_title, part=i, total=len(chunks), transcript=chunk
+                ),
+            )
+            for i, chunk in enumerate(chunks, 1)
+        ))
+        summaries = "\n\n".join(
+            f"## Part {i}\n{partial}" for i, partial in enumerate(partials, 1)
+        )
+        return await self._complete_limited(
+            _SYSTEM_PROMPT,
+            _REDUCE_PROMPT_TEMPLATE.format(
+                title=video_title, total=len(chunks), summaries=summaries
+            ),
+        )
+
 
 class ClaudeSummarizer(Summarizer):
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
 
-    def summarize(self, transcript: str, video_title: str) -> str:
-        message = self.client.messages.create(
+    async def complete(self, system: str, prompt: str) -> str:
+        message = await self.client.messages.create(
             model="claude-sonnet-4-5-20250929",
             max_tokens=4096,
-            system=_SYSTEM_PROMPT,
-            messages=[
-                {
-                    "role": "user",
-                    "content": _USER_PROMPT_TEMPLATE.format(
-                        title=video_title, transcript=transcript
-                    ),
-                }
-            ],
+            system=system,
+            messages=[{"role": "user", "content": prompt}],
         )
         return message.content[0].text
 
@@ -57,13 +133,8 @@ class GeminiSummarizer(Summarizer):
         genai.configure(api_key=settings.google_api_key)
         self.model = genai.GenerativeModel("gemini-2.0-flash")
 
-    def summarize(self, transcript: str, video_title: str) -> str:
-        prompt = (
-            _SYSTEM_PROMPT
-            + "\n\n"
-            + _USER_PROMPT_TEMPLATE.format(title=video_title, transcript=transcript)
-        )
-        response = self.model.generate_content(prompt)
+    async def complete(self, system: str, prompt: str) -> str:
+        response = await self.model.generate_content_async(system + "\n\n" + prompt)
         return response.text
 
 
@@ -71,9 +142,13 @@ class OpenRouterSummarizer(Summarizer):
     def __init__(self):
         self.api_key = settings.openrouter_api_key
         self.model = settings.openrouter_model
+        self.client = httpx.AsyncClient(
+            timeout=120,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+        )
 
-    def summarize(self, transcript: str, video_title: str) -> str:
-        resp = httpx.post(
+    async def complete(self, system: str, prompt: str) -> str:
+        resp = await self.client.post(
             "https://openrouter.ai/api/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {self.api_key}",
@@ -82,42 +157,38 @@ class OpenRouterSummarizer(Summarizer):
                 "model": self.model,
                 "max_tokens": 4096,
                 "messages": [
-                    {"role": "system", "content": _SYSTEM_PROMPT},
-                    {
-                        "role": "user",
-                        "content": _USER_PROMPT_TEMPLATE.format(
-                            title=video_title, transcript=transcript
-                        ),
-                    },
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt},
                 ],
             },
-            timeout=120,
         )
         resp.raise_for_status()
         return resp.json()["choices"][0]["message"]["content"]
 
 
 class OllamaSummarizer(Summarizer):
+    # Ollama on CPU serves one request at a time; queued ones would sit
+    # without a response byte until they hit the read timeout
+    max_parallel = 1
+
     def __init__(self):
         self.base_url = settings.ollama_base_url.rstrip("/")
         self.model = settings.ollama_model
+        self.client = httpx.AsyncClient(
+            timeout=600,  # local models can be slow on CPU
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+        )
 
-    def summarize(self, transcript: str, video_title: str) -> str:
-        resp = httpx.post(
+    async def complete(self, system: str, prompt: str) -> str:
+        resp = await self.client.post(
             f"{self.base_url}/v1/chat/completions",
             json={
                 "model": self.model,
                 "messages": [
-                    {"role": "system", "content": _SYSTEM_PROMPT},
-                    {
-                        "role": "user",
-                        "content": _USER_PROMPT_TEMPLATE.format(
-                            title=video_title, transcript=transcript
-                        ),
-                    },
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt},
                 ],
             },
-            timeout=600,  # local models can be slow on CPU
         )
         resp.raise_for_status()
         return resp.json()["choices"][0]["message"]["content"]
@@ -130,15 +201,20 @@ class FallbackSummarizer(Summarizer):
         self.primary = primary
         self.fallback = fallback
 
-    def summarize(self, transcript: str, video_title: str) -> str:
+    async def complete(self, system: str, prompt: str) -> str:
+        return await self.primary.complete(system, prompt)
+
+    async def summarize(self, transcript: str, video_title: str) -> str:
+        # Fall back for the whole summary, so one result never mixes chunk
+        # summaries from two different models
         try:
-            return self.primary.summarize(transcript, video_title)
+            return await self.primary.summarize(transcript, video_title)
         except Exception as e:
             logger.warning(
                 "Primary summarizer (%s) failed: %s — falling back to %s",
                 type(self.primary).__name__, e, type(self.fallback).__name__,
             )
-            return self.fallback.summarize(transcript, video_title)
+            return await self.fallback.summarize(transcript, video_title)
 
 
 _SUMMARIZER_MAP = {
@@ -1,3 +1,5 @@
+import asyncio
+import os
 import threading
 from dataclasses import dataclass
 
@@ -6,7 +8,7 @@ from faster_whisper import WhisperModel
 from app.config import settings
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptSegment:
     start: float
     end: float
@@ -38,6 +40,8 @@ def _format_time(seconds: float) -> str:
 
 _model = None
 _model_lock = threading.Lock()
+# Each run already uses every core; parallel runs would just oversubscribe them
+_transcribe_sem = asyncio.Semaphore(settings.whisper_concurrency)
 
 
 def _get_model() -> WhisperModel:
@@ -49,31 +53,51 @@ def _get_model() -> WhisperModel:
                     settings.whisper_model,
                     device="cpu",
                     compute_type=settings.whisper_compute_type,
+                    num_workers=1,
+                    cpu_threads=os.cpu_count() or 0,
                 )
     return _model
 
 
-def transcribe(audio_path: str, progress_callback=None) -> TranscriptResult:
-    """Transcribe audio file. progress_callback(segments_done, total_estimate) is called per segment."""
+def preload_model() -> None:
+    """Load the Whisper model up front so the first job doesn't pay for it."""
+    _get_model()
+
+
+def _start_transcription(audio_path: str):
     model = _get_model()
-    raw_segments, info = model.transcribe(
+    # Greedy decoding without cross-segment conditioning roughly doubles CPU
+    # throughput with negligible WER change (per the Distil-Whisper paper)
+    return model.transcribe(
         audio_path,
-        beam_size=5,
+        beam_size=1,
         vad_filter=True,
+        condition_on_previous_text=False,
     )
 
-    segments = []
-    text_parts = []
-    duration = info.duration
-    # Estimate total segments based on duration (~1 segment per 3-5 seconds of speech)
-    estimated_total = max(int(duration / 4), 1)
-
-    for seg in raw_segments:
-        segment = TranscriptSegment(start=seg.start, end=seg.end, text=seg.text.strip())
-        segments.append(segment)
-        text_parts.append(segment.text)
-        if progress_callback:
-            progress_callback(len(segments), estimated_total)
+
+async def transcribe(audio_path: str, progress_callback=None) -> TranscriptResult:
+    """Transcribe audio file. progress_callback(segments_done, total_estimate) is called per segment.
+
+    faster-whisper decodes lazily as the segment generator is consumed, so each
+    segment is pulled in its own short thread hop instead of pinning a worker
+    thread for the whole run. The callback runs on the event loop.
+    """
+    async with _transcribe_sem:
+        raw_segments, info = await asyncio.to_thread(_start_transcription, audio_path)
+
+        segments = []
+        text_parts = []
+        duration = info.duration
+        # Estimate total segments based on duration (~1 segment per 3-5 seconds of speech)
+        estimated_total = max(int(duration / 4), 1)
+
+        while (seg := await asyncio.to_thread(next, raw_segments, None)) is not None:
+            segment = TranscriptSegment(start=seg.start, end=seg.end, text=seg.text.strip())
+            segments.append(segment)
+            text_parts.append(segment.text)
+            if progress_callback:
+                progress_callback(len(segments), estimated_total)
 
     return TranscriptResult(
         text=" ".join(text_parts),
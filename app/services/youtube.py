@@ -1,11 +1,16 @@
+import asyncio
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import cached_property
 
 import yt_dlp
 
 
-@dataclass
+@dataclass(frozen=True)
 class VideoMetadata:
     video_id: str
     title: str
@@ -14,7 +19,7 @@ class VideoMetadata:
     channel: str
     upload_date: str
 
-    @property
+    @cached_property
     def duration_str(self) -> str:
         minutes, seconds = divmod(self.duration, 60)
         hours, minutes = divmod(minutes, 60)
@@ -23,27 +28,70 @@ class VideoMetadata:
         return f"{minutes}:{seconds:02d}"
 
 
+# Validation is a pure regex check (no extractor/network calls); video IDs are 11 chars.
+# Anchored at both ends with no nested quantifiers, so matching stays linear.
 _URL_PATTERN = re.compile(
-    r"^(https?://)?(www\.)?(youtube\.com/watch\?v=|youtu\.be/|youtube\.com/shorts/)[\w-]+"
+    r"(?:https?://)?(?:www\.|m\.)?(?:youtube\.com/(?:watch\?v=|shorts/|embed/)|youtu\.be/)"
+    r"([\w-]{11})(?:[/?&#]\S*)?"
 )
+_URL_MIN_LEN = len("youtu.be/") + 11
+_URL_MAX_LEN = 2048
 
 
 def validate_url(url: str) -> bool:
-    return bool(_URL_PATTERN.match(url))
-
-
-def fetch_metadata(url: str) -> VideoMetadata:
-    if not validate_url(url):
-        raise ValueError("Invalid YouTube URL")
-
-    opts = {
-        "quiet": True,
-        "no_warnings": True,
-        "skip_download": True,
-    }
-    with yt_dlp.YoutubeDL(opts) as ydl:
-        info = ydl.extract_info(url, download=False)
-
+    if not _URL_MIN_LEN <= len(url) <= _URL_MAX_LEN:
+        return False
+    return _URL_PATTERN.fullmatch(url) is not None
+
+
+def video_id_from_url(url: str) -> str | None:
+    """Return the 11-character video ID of a valid YouTube URL, else None."""
+    if not _URL_MIN_LEN <= len(url) <= _URL_MAX_LEN:
+        return None
+    match = _URL_PATTERN.fullmatch(url)
+    return match.group(1) if match else None
+
+
+# /api/metadata previews a URL right before /api/jobs submits it, so keep
+# recent lookups around instead of asking yt-dlp twice
+_META_CACHE_SIZE = 256
+_META_CACHE_TTL = 300
+_meta_cache: OrderedDict[str, tuple[float, VideoMetadata]] = OrderedDict()
+_meta_lock = threading.Lock()
+
+
+# Seconds a stalled connection may sit idle before the download is abandoned
+_STALL_TIMEOUT = 30
+
+# yt-dlp drives the transfer (cookies, headers, per-format ffmpeg options) via
+# its ffmpeg downloader, which is told to write 16kHz mono WAV instead of
+# copying the container, so no intermediate audio file hits disk. Metadata
+# lookups share the same options and simply pass download=False.
+_YDL_OPTS = {
+    "format": "bestaudio/best",
+    "quiet": True,
+    "no_warnings": True,
+    "socket_timeout": _STALL_TIMEOUT,
+    "outtmpl": "%(id)s.wav",
+    "external_downloader": {"default": "ffmpeg"},
+    "external_downloader_args": {
+        "ffmpeg_i": ["-rw_timeout", str(_STALL_TIMEOUT * 1_000_000)],
+        "ffmpeg_o": ["-vn", "-c:a", "pcm_s16le", "-ac", "1", "-ar", "16000", "-f", "wav"],
+    },
+}
+
+_local = threading.local()
+
+
+def _get_ydl() -> yt_dlp.YoutubeDL:
+    """Per-thread YoutubeDL, reused so its HTTP session and cookies carry over between calls."""
+    ydl = getattr(_local, "ydl", None)
+    if ydl is None:
+        ydl = _local.ydl = yt_dlp.YoutubeDL(_YDL_OPTS)
+    return ydl
+
+
+def _metadata_from_info(info: dict) -> VideoMetadata:
     return VideoMetadata(
         video_id=info["id"],
         title=info["title"],
@@ -54,35 +102,101 @@ def fetch_metadata(url: str) -> VideoMetadata:
     )
 
 
-def download_audio(url: str, output_dir: str) -> str:
-    """Download audio as 16kHz mono WAV. Returns the output file path."""
+def _cache_metadata(url: str, metadata: VideoMetadata, now: float) -> None:
+    with _meta_lock:
+        _meta_cache[url] = (now, metadata)
+        _meta_cache.move_to_end(url)
+        while len(_meta_cache) > _META_CACHE_SIZE:
+            _meta_cache.popitem(last=False)
+
+
+def fetch_metadata(url: str) -> VideoMetadata:
+    if not validate_url(url):
+        raise ValueError("Invalid YouTube URL")
+
+    cached = cached_metadata(url)
+    if cached is not None:
+        return cached
+
+    info = _get_ydl().extract_info(url, download=False)
+
+    metadata = _metadata_from_info(info)
+    _cache_metadata(url, metadata, time.monotonic())
+    return metadata
+
+
+def cached_metadata(url: str) -> VideoMetadata | None:
+    """Return metadata from a recent lookup of this URL, without calling yt-dlp."""
+    now = time.monotonic()
+    with _meta_lock:
+        cached = _meta_cache.get(url)
+        if cached and now - cached[0] < _META_CACHE_TTL:
+            _meta_cache.move_to_end(url)
+            return cached[1]
+    return None
+
+
+def fetch_and_download(url: str, output_dir: str) -> tuple[VideoMetadata, str]:
+    """Download audio as 16kHz mono WAV and return its metadata with the file path.
+
+    Uses a single extract_info pass, so the video page is only resolved once.
+    Requires ffmpeg on PATH.
+    """
     if not validate_url(url):
         raise ValueError("Invalid YouTube URL")
 
-    os.makedirs(output_dir, exist_ok=True)
-    output_template = os.path.join(output_dir, "%(id)s.%(ext)s")
-
-    opts = {
-        "format": "bestaudio/best",
-        "outtmpl": output_template,
-        "quiet": True,
-        "no_warnings": True,
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "wav",
-            }
-        ],
-        "postprocessor_args": [
-            "-ar", "16000",
-            "-ac", "1",
-        ],
-    }
-    with yt_dlp.YoutubeDL(opts) as ydl:
-        info = ydl.extract_info(url, download=True)
-        video_id = info["id"]
-
-    wav_path = os.path.join(output_dir, f"{video_id}.wav")
-    if not os.path.exists(wav_path):
-        raise RuntimeError(f"Audio download failed: {wav_path} not found")
-    return wav_path
+    _ensure_dir(output_dir)
+
+    ydl = _get_ydl()
+    ydl.params["paths"] = {"home": output_dir}
+    info = ydl.extract_info(url, download=False)
+    metadata = _metadata_from_info(info)
+    _cache_metadata(url, metadata, time.monotonic())
+
+    # Reuse the resolved info for the download instead of extracting again
+    wav_path = os.path.join(output_dir, f"{metadata.video_id}.wav")
+    try:
+        ydl.process_ie_result(info, download=True)
+    except Exception:
+        # Only remove this download's files: output_dir may be shared with
+        # other downloads, so removing it is left to whoever owns it
+        for path in (wav_path, wav_path + ".part"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        raise
+    return metadata, wav_path
+
+
+# Parent directories (the data dir) already created; each job dir is new, so
+# it only needs a single mkdir rather than makedirs' stat-then-mkdir walk
+_ensured_dirs: set[str] = set()
+
+
+def _ensure_dir(path: str) -> None:
+    parent = os.path.dirname(path)
+    if parent and parent not in _ensured_dirs:
+        os.makedirs(parent, exist_ok=True)
+        _ensured_dirs.add(parent)
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        pass
+
+
+def download_audio(url: str, output_dir: str) -> str:
+    """Download audio as 16kHz mono WAV. Returns the output file path."""
+    return fetch_and_download(url, output_dir)[1]
+
+
+async def download_audio_many(urls: list[str], output_dir: str) -> list[str | Exception]:
+    """Download several videos concurrently.
+
+    Returns the WAV paths in input order, with the exception in place of any
+    download that failed; the others still run to completion.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(download_audio, url, output_dir) for url in urls),
+        return_exceptions=True,
+    )
@@ -1,103 +1,389 @@
 import json
 import os
+import queue
 import sqlite3
+import struct
 import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import partial
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
 
 from app.config import settings
 from app.models import Job, JobStatus
-from app.services.youtube import VideoMetadata
+from app.services.youtube import VideoMetadata, video_id_from_url
 from app.services.transcriber import TranscriptSegment
 
 _db_path = os.path.join(settings.data_dir, "jobs.db")
-_local = threading.local()
+
+# One writer connection, serialized by a lock, plus a small pool of read-only
+# connections so history/result reads run in parallel under WAL. All are
+# opened once per process, shared across threads, and run in autocommit mode
+# with transactions managed explicitly (BEGIN IMMEDIATE ... COMMIT)
+_READ_POOL_SIZE = 4
+_READ_POOL_TIMEOUT = 30
+_writer_conn: sqlite3.Connection | None = None
+_writer_lock = threading.Lock()
+_read_pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+_read_pool_lock = threading.Lock()
+_readers_opened = 0
 
 
-def _get_conn() -> sqlite3.Connection:
-    if not hasattr(_local, "conn"):
+def _open(read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        conn = sqlite3.connect(
+            f"file:{_db_path}?mode=ro", uri=True, check_same_thread=False, isolation_level=None
+        )
+    else:
         os.makedirs(settings.data_dir, exist_ok=True)
-        _local.conn = sqlite3.connect(_db_path)
-        _local.conn.row_factory = sqlite3.Row
-    return _local.conn
+        conn = sqlite3.connect(_db_path, check_same_thread=False, isolation_level=None)
+        if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            # Layout pragmas only apply before the first page is written (and
+            # switching to WAL writes it). Larger pages shorten the overflow
+            # chains of transcript rows; incremental auto-vacuum lets freed
+            # pages be returned to the filesystem.
+            conn.execute("PRAGMA page_size=8192")
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.row_factory = sqlite3.Row
+    _configure(conn, read_only)
+    return conn
+
+
+def _configure(conn: sqlite3.Connection, read_only: bool):
+    # WAL lets history reads proceed while a job is being saved, and
+    # synchronous=NORMAL only fsyncs at checkpoints instead of every commit
+    if not read_only and _db_path != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
+
+
+@contextmanager
+def _writer() -> Iterator[sqlite3.Connection]:
+    global _writer_conn
+    with _writer_lock:
+        if _writer_conn is None:
+            _writer_conn = _open()
+        yield _writer_conn
+
+
+@contextmanager
+def _reader() -> Iterator[sqlite3.Connection]:
+    global _readers_opened
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        with _read_pool_lock:
+            opened = _readers_opened < _READ_POOL_SIZE
+            if opened:
+                _readers_opened += 1
+        if opened:
+            try:
+                conn = _open(read_only=True)
+            except BaseException:
+                # Give the slot back, or failed opens would eventually leave
+                # every reader waiting on a pool that never fills
+                with _read_pool_lock:
+                    _readers_opened -= 1
+                raise
+        else:
+            try:
+                conn = _read_pool.get(timeout=_READ_POOL_TIMEOUT)
+            except queue.Empty:
+                raise sqlite3.OperationalError("timed out waiting for a database connection") from None
+    try:
+        yield conn
+    finally:
+        _read_pool.put(conn)
 
 
 def init_db():
-    conn = _get_conn()
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS jobs (
-            id TEXT PRIMARY KEY,
-            url TEXT NOT NULL,
-            title TEXT,
-            channel TEXT,
-            thumbnail TEXT,
-            duration INTEGER,
-            upload_date TEXT,
-            transcript_text TEXT,
-            transcript_segments TEXT,
-            transcript_language TEXT,
-            summary TEXT,
-            created_at REAL,
-            download_time REAL DEFAULT 0,
-            transcribe_time REAL DEFAULT 0,
-            summarize_time REAL DEFAULT 0,
-            whisper_model TEXT DEFAULT '',
-            summarizer_model TEXT DEFAULT ''
-        )
-    """)
-    # Migrate existing databases that lack new columns
-    existing = {r[1] for r in conn.execute("PRAGMA table_info(jobs)").fetchall()}
-    migrations = {
-        "download_time": "REAL DEFAULT 0",
-        "transcribe_time": "REAL DEFAULT 0",
-        "summarize_time": "REAL DEFAULT 0",
-        "whisper_model": "TEXT DEFAULT ''",
-        "summarizer_model": "TEXT DEFAULT ''",
-        "created_by": "TEXT DEFAULT ''",
-    }
-    for col, typedef in migrations.items():
-        if col not in existing:
-            conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {typedef}")
-    conn.commit()
-
-
-def save_job(job: Job):
-    conn = _get_conn()
-    segments_json = json.dumps(
-        [{"start": s.start, "end": s.end, "text": s.text} for s in job.transcript_segments]
+    with _writer() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0:
+            # Databases created before auto-vacuum was enabled need one full
+            # VACUUM to switch over (page_size stays, WAL files can't change it)
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT,
+                channel TEXT,
+                thumbnail TEXT,
+                duration INTEGER,
+                upload_date TEXT,
+                transcript_text TEXT,
+                transcript_segments TEXT,
+                transcript_language TEXT,
+                summary TEXT,
+                created_at REAL,
+                download_time REAL DEFAULT 0,
+                transcribe_time REAL DEFAULT 0,
+                summarize_time REAL DEFAULT 0,
+                whisper_model TEXT DEFAULT '',
+                summarizer_model TEXT DEFAULT ''
+            )
+        """)
+        # Migrate existing databases that lack new columns
+        existing = {r[1] for r in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+        migrations = {
+            "download_time": "REAL DEFAULT 0",
+            "transcribe_time": "REAL DEFAULT 0",
+            "summarize_time": "REAL DEFAULT 0",
+            "whisper_model": "TEXT DEFAULT ''",
+            "summarizer_model": "TEXT DEFAULT ''",
+            "created_by": "TEXT DEFAULT ''",
+            # Segments as struct-of-arrays blobs (see _pack_segments)
+            "segments_starts": "BLOB",
+            "segments_ends": "BLOB",
+            "segments_texts": "BLOB",
+            # Thumbnails are derived from this; the thumbnail column is legacy-only
+            "video_id": "TEXT",
+        }
+        for col, typedef in migrations.items():
+            if col not in existing:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {col} {typedef}")
+        # Rows saved before video_id existed: recover it from the job URL
+        backfill = []
+        for job_id, url in conn.execute("SELECT id, url FROM jobs WHERE video_id IS NULL"):
+            video_id = video_id_from_url(url)
+            if video_id:
+                backfill.append((video_id, job_id))
+        conn.executemany("UPDATE jobs SET video_id = ? WHERE id = ?", backfill)
+        # Per-segment rows for queries like transcript search, filled from JSON on save
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS segments (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                "start" REAL,
+                "end" REAL,
+                text TEXT,
+                PRIMARY KEY (job_id, idx)
+            )
+        """)
+        # Covers the history query so it walks the index in order and stops at LIMIT.
+        # thumbnail stays in it for old rows but is NULL (one byte) for new ones.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_history
+            ON jobs(created_at DESC, id, title, channel, video_id, thumbnail, duration, created_by)
+        """)
+        conn.commit()
+
+
+def incremental_vacuum(pages: int = 100):
+    """Return up to `pages` free pages (e.g. from replaced segment rows) to the filesystem."""
+    with _writer() as conn:
+        if conn.execute("PRAGMA freelist_count").fetchone()[0]:
+            # The pragma frees one page per step, and execute() stops after the
+            # first since it reports no result columns; executescript() runs it out
+            conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+
+
+# YouTube thumbnails share one URL shape, so only the video ID is stored
+_THUMBNAIL_URL = "https://i.ytimg.com/vi/{}/mqdefault.jpg"
+_THUMBNAIL_SQL = "COALESCE(thumbnail, 'https://i.ytimg.com/vi/' || video_id || '/mqdefault.jpg')"
+
+_INSERT_SQL = """INSERT OR REPLACE INTO jobs
+   (id, url, title, channel, video_id, duration, upload_date,
+    transcript_text, segments_starts, segments_ends, segments_texts,
+    transcript_language, summary, created_at,
+    download_time, transcribe_time, summarize_time, whisper_model, summarizer_model,
+    created_by)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def _pack_segments(segments: list[TranscriptSegment]) -> tuple[bytes, bytes, bytes]:
+    """Pack segments into little-endian float32 start/end arrays and a text blob.
+
+    The text blob is n uint32 byte lengths followed by the concatenated UTF-8
+    texts, so decoding needs no JSON parsing and floats take 4 bytes each.
+    """
+    n = len(segments)
+    texts = [s.text.encode() for s in segments]
+    return (
+        struct.pack(f"<{n}f", *(s.start for s in segments)),
+        struct.pack(f"<{n}f", *(s.end for s in segments)),
+        struct.pack(f"<{n}I", *map(len, texts)) + b"".join(texts),
     )
-    conn.execute(
-        """INSERT OR REPLACE INTO jobs
-           (id, url, title, channel, thumbnail, duration, upload_date,
-            transcript_text, transcript_segments, transcript_language, summary, created_at,
-            download_time, transcribe_time, summarize_time, whisper_model, summarizer_model,
-            created_by)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (
-            job.id,
-            job.url,
-            job.metadata.title if job.metadata else "",
-            job.metadata.channel if job.metadata else "",
-            job.metadata.thumbnail if job.metadata else "",
-            job.metadata.duration if job.metadata else 0,
-            job.metadata.upload_date if job.metadata else "",
-            job.transcript_text,
-            segments_json,
-            job.transcript_language,
-            job.summary,
-            job.created_at,
-            job.download_time,
-            job.transcribe_time,
-            job.summarize_time,
-            job.whisper_model,
-            job.summarizer_model,
-            job.created_by,
-        ),
+
+
+def _unpack_segments(starts: bytes, ends: bytes, texts: bytes) -> list[TranscriptSegment]:
+    n = len(starts) // 4
+    lengths = struct.unpack_from(f"<{n}I", texts)
+    segments = []
+    pos = 4 * n
+    for start, end, length in zip(
+        struct.unpack(f"<{n}f", starts), struct.unpack(f"<{n}f", ends), lengths
+    ):
+        segments.append(
+            TranscriptSegment(start=start, end=end, text=texts[pos:pos + length].decode())
+        )
+        pos += length
+    return segments
+
+
+_json_loads = orjson.loads if orjson else json.loads
+
+
+def _segment_tuple(s: TranscriptSegment) -> tuple[float, float, str]:
+    return (s.start, s.end, s.text)
+
+
+def _segments_json(segments: list[TranscriptSegment]) -> str:
+    """Encode segments as a compact [[start, end, text], ...] array."""
+    if orjson:
+        # Passthrough makes orjson hand dataclasses to default= instead of
+        # emitting keyed objects; SQLite's JSON functions reject bytes, so decode
+        return orjson.dumps(
+            segments, default=_segment_tuple, option=orjson.OPT_PASSTHROUGH_DATACLASS
+        ).decode()
+    return json.dumps(segments, default=_segment_tuple)
+
+
+# One statement expands the whole segment array into rows inside SQLite
+_INSERT_SEGMENTS_SQL = """INSERT OR REPLACE INTO segments (job_id, idx, "start", "end", text)
+   SELECT ?, key, value->>0, value->>1, value->>2 FROM json_each(?)"""
+
+
+def _segments_from_json(raw: str) -> list[TranscriptSegment]:
+    return [
+        TranscriptSegment(start=s["start"], end=s["end"], text=s["text"])
+        for s in _json_loads(raw)
+    ]
+
+
+def _job_row(job: Job) -> tuple:
+    meta = job.metadata
+    return (
+        job.id,
+        job.url,
+        meta.title if meta else "",
+        meta.channel if meta else "",
+        (meta.video_id or None) if meta else None,
+        meta.duration if meta else 0,
+        meta.upload_date if meta else "",
+        job.transcript_text,
+        *_pack_segments(job.transcript_segments),
+        job.transcript_language,
+        job.summary,
+        job.created_at,
+        job.download_time,
+        job.transcribe_time,
+        job.summarize_time,
+        job.whisper_model,
+        job.summarizer_model,
+        job.created_by,
     )
-    conn.commit()
+
+
+def save_jobs(jobs: list[Job]):
+    """Save several jobs in a single transaction."""
+    with _writer() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT_SQL, (_job_row(job) for job in jobs))
+            for job in jobs:
+                conn.execute("DELETE FROM segments WHERE job_id = ?", (job.id,))
+                conn.execute(_INSERT_SEGMENTS_SQL, (job.id, _segments_json(job.transcript_segments)))
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+# Saves are queued to a single writer thread that coalesces everything
+# arriving within a short window into one transaction and one commit
+_SAVE_BATCH_WINDOW = 0.05
+_SAVE_BATCH_MAX = 64
+_save_q: queue.Queue[tuple[Job | None, Future]] = queue.Queue()
+_save_thread: threading.Thread | None = None
+_save_thread_lock = threading.Lock()
+
+
+def _save_loop():
+    while True:
+        batch = [_save_q.get()]
+        # A lone save commits right away; the window only applies under load,
+        # when other saves were already queued behind the first
+        if not _save_q.empty():
+            deadline = time.monotonic() + _SAVE_BATCH_WINDOW
+            while len(batch) < _SAVE_BATCH_MAX:
+                try:
+                    batch.append(_save_q.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+        # A None job is a flush() barrier; it just completes with the batch
+        pending = [job for job, _ in batch if job is not None]
+        try:
+            if pending:
+                save_jobs(pending)
+        except Exception:
+            # Retry one by one so only the job that actually fails gets the error
+            for job, fut in batch:
+                if job is None:
+                    fut.set_result(None)
+                    continue
+                try:
+                    save_jobs([job])
+                except Exception as e:
+                    fut.set_exception(e)
+                else:
+                    fut.set_result(None)
+        else:
+            for _, fut in batch:
+                fut.set_result(None)
+
+
+def _enqueue(job: Job | None) -> Future:
+    global _save_thread
+    with _save_thread_lock:
+        if _save_thread is None:
+            _save_thread = threading.Thread(target=_save_loop, name="storage-writer", daemon=True)
+            _save_thread.start()
+    fut: Future = Future()
+    _save_q.put((job, fut))
+    return fut
+
+
+def save_job(job: Job, wait: bool = True):
+    """Queue a job for the writer thread.
+
+    By default this blocks until the batch holding the job is committed, so
+    callers can read it back right away; pass wait=False to fire and forget.
+    """
+    fut = _enqueue(job)
+    if wait:
+        fut.result()
+
+
+def flush():
+    """Block until every save queued so far has been committed."""
+    _enqueue(None).result()
+
+
+# The legacy JSON segments are only read for rows saved before the blob columns existed
+_JOB_COLS = (
+    "id, url, title, channel, video_id, thumbnail, duration, upload_date, transcript_language, summary,"
+    " created_at, download_time, transcribe_time, summarize_time, whisper_model,"
+    " summarizer_model, created_by, transcript_text, segments_starts, segments_ends, segments_texts,"
+    " CASE WHEN segments_starts IS NULL THEN transcript_segments END AS transcript_segments"
+)
 
 
 def load_job(job_id: str) -> Job | None:
-    conn = _get_conn()
-    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    with _reader() as conn:
+        row = conn.execute(f"SELECT {_JOB_COLS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
     if not row:
         return None
     return _row_to_job(row)
@@ -105,26 +391,47 @@ def load_job(job_id: str) -> Job | None:
 
 def list_jobs(limit: int = 20) -> list[dict]:
     """Return recent jobs as lightweight dicts for the history list."""
-    conn = _get_conn()
-    rows = conn.execute(
-        "SELECT id, title, channel, thumbnail, duration, created_at, created_by FROM jobs ORDER BY created_at DESC LIMIT ?",
-        (limit,),
-    ).fetchall()
+    with _reader() as conn:
+        rows = conn.execute(
+            f"""SELECT id, title, channel, {_THUMBNAIL_SQL} AS thumbnail, duration, created_at,
+                       created_by, printf('%dm%02ds', duration / 60, duration % 60) AS duration_str
+                FROM jobs ORDER BY created_at DESC LIMIT ?""",
+            (limit,),
+        ).fetchall()
     return [dict(r) for r in rows]
 
 
+def list_jobs_json(limit: int = 20) -> str:
+    """Same rows as list_jobs, serialized to a JSON array by SQLite itself."""
+    with _reader() as conn:
+        row = conn.execute(
+            f"""SELECT json_group_array(json_object(
+                    'id', id, 'title', title, 'channel', channel, 'thumbnail', thumbnail,
+                    'duration', duration, 'created_at', created_at, 'created_by', created_by))
+                FROM (SELECT id, title, channel, {_THUMBNAIL_SQL} AS thumbnail, duration,
+                             created_at, created_by
+                      FROM jobs ORDER BY created_at DESC LIMIT ?)""",
+            (limit,),
+        ).fetchone()
+    return row[0]
+
+
 def _row_to_job(row: sqlite3.Row) -> Job:
-    segments = [
-        TranscriptSegment(start=s["start"], end=s["end"], text=s["text"])
-        for s in json.loads(row["transcript_segments"])
-    ]
+    if row["segments_starts"] is not None:
+        load_segments = partial(
+            _unpack_segments, row["segments_starts"], row["segments_ends"], row["segments_texts"]
+        )
+    else:
+        # Rows saved before the binary columns existed
+        load_segments = partial(_segments_from_json, row["transcript_segments"] or "[]")
     metadata = None
     if row["title"]:
+        video_id = row["video_id"] or video_id_from_url(row["url"]) or ""
         metadata = VideoMetadata(
-            video_id=row["id"],
+            video_id=video_id,
             title=row["title"],
             channel=row["channel"],
-            thumbnail=row["thumbnail"],
+            thumbnail=row["thumbnail"] or (_THUMBNAIL_URL.format(video_id) if video_id else ""),
             duration=row["duration"],
             upload_date=row["upload_date"],
         )
@@ -135,7 +442,7 @@ def _row_to_job(row: sqlite3.Row) -> Job:
         progress=100,
         metadata=metadata,
         transcript_text=row["transcript_text"],
-        transcript_segments=segments,
+        _segments_loader=load_segments,
         transcript_language=row["transcript_language"],
         summary=row["summary"],
         created_at=row["created_at"],